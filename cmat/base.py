@@ -7,24 +7,28 @@ and calculating the transit timing variations (TTVs) of the planet.
 Functions:
 - get_id(planet_name: str) -> int:
     Given the name of a planet, returns its TESS ID.
+    The response is cached on disk for a day.
 - get_prop(planet_name: str, tic: int) -> dict:
     Given the name of a planet and its TESS ID,
     returns a dictionary of its properties.
+    The response is cached on disk for a day.
 - truncate_colormap(cmap, minval=0.0, maxval=1.0, n=100)
     -> matplotlib.colors.LinearSegmentedColormap:
     Truncates a colormap to a specified range.
-- save_df_data(dir_path, file_name, df_data):
-    Creates a new directory and saves data, while also checking if the folder
-    exists and asking the user if they want to create a new folder,
-    and if the file already exists, asking if the user wants to overwrite it.
-- read_data(name: str) -> file:
-    Reads data from a file.
+- save_df_data(
+    dir_path, file_name, df_data, *, overwrite=False, create_dirs=True
+  ):
+    Saves data, creating the directory if needed and refusing to overwrite
+    an existing file unless asked to.
+    The format (parquet, feather or CSV) follows the file extension.
+- read_data(name: str) -> pandas.DataFrame:
+    Reads data saved by `save_df_data` from a parquet, feather or CSV file.
 - getn(unfloat) -> float:
     Given an `uncertainties.ufloat` object, returns its nominal value.
 - gets(unfloat) -> float:
     Given an `uncertainties.ufloat` object, returns its standard deviation.
-- epoch_v = np.vectorize(epoch) -> np.vectorize:
-    Vectorizes the `epoch` function.
+- epoch_v(time, zero_epoch, period) -> np.ndarray:
+    Applies the `epoch` function to an array of times.
 - fitlpf:
     A class that performs a transit fit to a light curve using the
     pytransit package. It also includes functions for downloading data
@@ -37,16 +41,23 @@ Functions:
         Gets the parameters of the planet.
     - print_parameters(self):
         Prints the parameters of the planet.
-    - download_data(self) -> astropy.table.table.Table:
+    - download_data(self, product=None, number_of_threads=4)
+        -> astropy.table.table.Table:
         Downloads data from the MAST archive.
-    - de(self, niter=200, npop=30, datadir=None):
+    - de(self, niter=200, npop=30, datadir=None, number_of_threads=None):
         Performs a differential evolution fit to the light curve.
     - plot_original_data(self) -> matplotlib.figure.Figure:
         Plots the original light curve.
     - fit_single(self, i, niter=100, npop=50, mcmc_repeats=4) -> SingleFit:
         Fits a single transit.
-    - fit_singles(self, niter=100, npop=50):
-        Fits all transits.
+    - fit_singles(
+        self,
+        niter=100,
+        npop=50,
+        mcmc_repeats=4,
+        number_of_threads=None
+    ):
+        Fits all transits in parallel.
     - get_posterior_samples(self):
         Gets the posterior samples of the transit fits.
     - calculate_ttv(self):
@@ -63,21 +74,25 @@ Functions:
 """
 
 import os
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial, wraps
+from multiprocessing import get_context
 import numpy as np
+import pandas as pd
 import requests
+import diskcache
 import matplotlib.pyplot as plt
 import matplotlib.colors as colors
+from numba import njit
+from astropy.table import vstack
 from astroquery.mast import Observations
 
 # import rebound
 
 # import scipy.stats
-# from multiprocessing import get_context
-# from tqdm.auto import tqdm
 from uncertainties import ufloat
 from pytransit.lpf.tesslpf import TESSLPF
 from pytransit.orbits import epoch
-from scipy.optimize import curve_fit
 from cmat.singlefit import SingleFit
 from tqdm.auto import tqdm
 
@@ -86,6 +101,16 @@ DVURL = "https://exo.mast.stsci.edu/api/v0.1/dvdata/tess/"
 URL = PLANETURL + "/identifiers/"
 header = {}
 
+# The MAST responses for a planet rarely change, so keep them on disk for a
+# day to avoid repeating the HTTP requests on every run.
+HTTP_CACHE_DIR = os.path.expanduser("~/.cmat/http_cache")
+HTTP_CACHE_EXPIRE = 24 * 60 * 60
+_http_cache = None
+
+# Both lookups hit the same host, so share one session to reuse the
+# connection.
+_session = requests.Session()
+
 MJ_TO_MS = 9.5e-4
 ME_TO_MS = 3.0e-6
 RJ_TO_RS = 0.102792236
@@ -93,6 +118,45 @@ RS_TO_AU = 0.00464913034
 DAY_TO_SEC = 24 * 60 * 60
 
 
+def _get_http_cache():
+    """
+    Open the on-disk HTTP cache on first use.
+
+    Returns:
+        diskcache.Cache: The cache, or None if it cannot be created, in
+        which case lookups are not cached.
+    """
+    global _http_cache
+    if _http_cache is None:
+        try:
+            _http_cache = diskcache.Cache(HTTP_CACHE_DIR)
+        except OSError:
+            return None
+    return _http_cache
+
+
+def _cache_lookup(func):
+    """
+    Cache the results of a MAST lookup on disk for `HTTP_CACHE_EXPIRE`
+    seconds. Failed lookups raise and are therefore not cached.
+    """
+
+    @wraps(func)
+    def wrapper(planet_name: str):
+        cache = _get_http_cache()
+        if cache is None:
+            return func(planet_name)
+        key = (func.__name__, planet_name)
+        result = cache.get(key)
+        if result is None:
+            result = func(planet_name)
+            cache.set(key, result, expire=HTTP_CACHE_EXPIRE)
+        return result
+
+    return wrapper
+
+
+@_cache_lookup
 def get_id(planet_name: str):
     """
     Get the TIC ID for a given planet name.
@@ -104,13 +168,15 @@ def get_id(planet_name: str):
         int: The TIC ID of the planet.
     """
     myparams = {"name": planet_name}
-    r = requests.get(url=URL, params=myparams, headers=header, timeout=10)
+    r = _session.get(url=URL, params=myparams, headers=header, timeout=10)
+    r.raise_for_status()
     planet_names = r.json()
     ticid = planet_names["tessID"]
 
     return ticid
 
 
+@_cache_lookup
 def get_prop(planet_name: str):
     """
     Get the properties of a planet.
@@ -119,11 +185,19 @@ def get_prop(planet_name: str):
         planet_name (str): The name of the planet.
 
     Returns:
-        dict: The properties of the planet in JSON format.
+        list: The properties of the planet in JSON format, one entry per
+        catalog.
+
+    Raises:
+        ValueError: If MAST returns no properties for the planet.
     """
     url = PLANETURL + planet_name + "/properties/"
-    r = requests.get(url=url, headers=header, timeout=10)
-    return r.json()
+    r = _session.get(url=url, headers=header, timeout=10)
+    r.raise_for_status()
+    prop = r.json()
+    if not isinstance(prop, list) or not prop:
+        raise ValueError(f"MAST returned no properties for {planet_name}.")
+    return prop
 
 
 def truncate_colormap(cmap, minval=0.0, maxval=1.0, n=100):
@@ -138,56 +212,67 @@ def truncate_colormap(cmap, minval=0.0, maxval=1.0, n=100):
     return new_cmap
 
 
-def save_df_data(dir_path, file_name, df_data):
+def save_df_data(dir_path, file_name, df_data, *, overwrite=False, create_dirs=True):
     """
-    create a new directory and save data, while also checking if the folder
-    exists and asking the user if they want to create a new folder, and if the
-    file already exists, asking if the user wants to overwrite it
+    Save data to a file, creating the directory if needed.
+
+    The data is written as parquet or feather when `file_name` ends with
+    ".parquet" or ".feather", and as CSV otherwise.
+
+    Args:
+        dir_path (str): The directory to save the file in.
+        file_name (str): The name of the file.
+        df_data (pandas.DataFrame): The data to save.
+        overwrite (bool): Whether to overwrite an existing file.
+        Default is False.
+        create_dirs (bool): Whether to create `dir_path` if it doesn't
+        exist. Default is True.
+
+    Raises:
+        FileNotFoundError: If `dir_path` doesn't exist and `create_dirs`
+        is False.
+        FileExistsError: If the file already exists and `overwrite` is
+        False.
     """
     # Check if the directory exists:
     if not os.path.exists(dir_path):
-        # The directory doesn't exist, so ask the user if they want to create
-        # it:
-        create_dir = input(
-            "The directory doesn't exist. Would you like to create it? (y/n) "
-        )
-        if create_dir.lower() == "y":
-            os.makedirs(dir_path)
-        else:
-            print("Unable to save data.")
-            exit()
+        if not create_dirs:
+            raise FileNotFoundError(f"The directory {dir_path} doesn't exist.")
+        os.makedirs(dir_path)
 
     # Check if the file already exists:
     file_path = os.path.join(dir_path, file_name)
-    if os.path.exists(file_path):
-        # The file already exists, so ask the user if they want to overwrite
-        # it:
-        overwrite_file = input(
-            "The file already exists. Do you want to overwrite it? (y/n) "
-        )
-        if overwrite_file.lower() != "y":
-            print("Unable to save data.")
-            exit()
+    if os.path.exists(file_path) and not overwrite:
+        raise FileExistsError(f"The file {file_path} already exists.")
 
-    # Save some example data to the file:
-    df_data.to_csv(file_path, index=False)
+    # Save the data in the format given by the file extension:
+    if file_name.endswith(".parquet"):
+        df_data.to_parquet(file_path, engine="pyarrow", compression="zstd", index=False)
+    elif file_name.endswith(".feather"):
+        df_data.reset_index(drop=True).to_feather(file_path)
+    else:
+        df_data.to_csv(file_path, index=False)
 
     print("Data saved successfully!")
 
 
 def read_data(name: str):
     """
-    Read data from a file.
+    Read data saved by `save_df_data` from a parquet, feather or CSV file,
+    depending on the file extension.
 
     Args:
         name (str): The name of the file to read.
 
     Returns:
-        file: The opened file object.
+        pandas.DataFrame: The data in the file.
 
     """
-    with open(name, "r", encoding="utf-8") as file:
-        return file
+    if name.endswith(".parquet"):
+        return pd.read_parquet(name, engine="pyarrow")
+    if name.endswith(".feather"):
+        return pd.read_feather(name)
+    return pd.read_csv(name, engine="c")
 
 
 def getn(unfloat):
@@ -216,9 +301,157 @@ def gets(unfloat):
     return unfloat.s
 
 
-getn_v = np.vectorize(getn)
-gets_v = np.vectorize(gets)
-epoch_v = np.vectorize(epoch)
+@njit(cache=True)
+def _epoch_batch(time, zero_epoch, period, out):
+    """
+    Fill `out` with the epoch numbers of `time`, as `pytransit.orbits.epoch`.
+    """
+    for i in range(time.size):
+        out[i] = np.floor((time[i] - zero_epoch + 0.5 * period) / period)
+
+
+def epoch_v(time, zero_epoch, period):
+    """
+    Get the epoch numbers of an array of times.
+
+    This is the array form of `pytransit.orbits.epoch`, evaluated by a
+    Numba-compiled loop.
+
+    Parameters:
+    time (np.ndarray): The times.
+    zero_epoch (float): The zero epoch.
+    period (float): The orbital period.
+
+    Returns:
+    np.ndarray: The integer epoch numbers.
+    """
+    time = np.ascontiguousarray(time, dtype=np.float64)
+    out = np.empty(time.size, dtype=np.int64)
+    _epoch_batch(time, float(zero_epoch), float(period), out)
+    return out
+
+
+@njit(cache=True, fastmath=True)
+def _ttv_residuals(tcs, tcs_s, epochs, period_s, day_to_sec):
+    """
+    Fit a linear ephemeris to the transit centers and return the residuals.
+
+    Args:
+        tcs (np.ndarray): Nominal transit centers in days.
+        tcs_s (np.ndarray): Uncertainties of the transit centers in days.
+        epochs (np.ndarray): Epoch numbers of the transits.
+        period_s (float): Uncertainty of the orbital period in days.
+        day_to_sec (float): Conversion factor from days to seconds.
+
+    Returns:
+        tuple: (ttv_raw, ttv, ttv_err) in seconds, where ttv is ttv_raw with
+        its mean removed.
+    """
+    n = tcs.size
+    t0 = tcs[0]
+    e0 = epochs[0]
+
+    x_mean = 0.0
+    y_mean = 0.0
+    for i in range(n):
+        x_mean += epochs[i] - e0
+        y_mean += tcs[i] - t0
+    x_mean /= n
+    y_mean /= n
+
+    sxx = 0.0
+    sxy = 0.0
+    for i in range(n):
+        dx = epochs[i] - e0 - x_mean
+        sxx += dx * dx
+        sxy += dx * (tcs[i] - t0 - y_mean)
+    a = sxy / sxx
+    b = y_mean - a * x_mean
+
+    ttv_raw = np.empty(n)
+    ttv_err = np.empty(n)
+    raw_mean = 0.0
+    for i in range(n):
+        x = epochs[i] - e0
+        ttv_raw[i] = (tcs[i] - t0 - a * x + b) * day_to_sec
+        ttv_err[i] = (tcs_s[i] + period_s * x) * day_to_sec
+        raw_mean += ttv_raw[i]
+    raw_mean /= n
+
+    ttv = np.empty(n)
+    for i in range(n):
+        ttv[i] = ttv_raw[i] - raw_mean
+    return ttv_raw, ttv, ttv_err
+
+
+_de_lpf = None
+
+
+def _init_de_worker(lpf):
+    """
+    Store the LPF optimised by `Fitlpf.de` in a DE worker process.
+
+    The LPF is handed over once per worker by the pool initializer, so only
+    the parameter vector has to be pickled for each evaluation. The value
+    is only ever set inside the worker processes.
+    """
+    global _de_lpf
+    _de_lpf = lpf
+
+
+def _de_lnposterior(pv):
+    """
+    Evaluate the log posterior of the LPF held by a DE worker process.
+    """
+    return _de_lpf.lnposterior(pv)
+
+
+def _fit_single(args):
+    """
+    Fit a single transit light curve.
+
+    This is a module-level function so that it can be dispatched to
+    worker processes by `Fitlpf.fit_singles`.
+
+    Args:
+        args (tuple): (name, time, flux, tc_n, tc_s, period_n, period_s,
+        niter, npop, mcmc_repeats, use_tqdm), where tc_n and tc_s are the
+        predicted transit center and its uncertainty, and use_tqdm turns
+        on pytransit's progress bars.
+
+    Returns:
+        SingleFit: The fitted single transit light curve.
+    """
+    (
+        name,
+        time,
+        flux,
+        tc_n,
+        tc_s,
+        period_n,
+        period_s,
+        niter,
+        npop,
+        mcmc_repeats,
+        use_tqdm,
+    ) = args
+    single = SingleFit(name, None, time, flux)
+
+    single.set_prior("tc", "NP", tc_n, tc_s)  # Wide normal prior on the transit center
+    single.set_prior(
+        "p", "NP", period_n, period_s
+    )  # Wide normal prior on the orbital period
+    single.set_prior("rho", "UP", 0, 1)
+    # Uniform prior on the stellar density
+    single.set_prior("k2", "UP", 0.0, 0.2**2)
+    # Uniform prior on the area ratio
+    # Workers of fit_singles run with use_tqdm=False, their progress bars
+    # would contend for the terminal with the one of the parent process.
+    single.optimize_global(niter=niter, npop=npop, use_tqdm=use_tqdm)
+    single.sample_mcmc(
+        2500, thin=25, repeats=mcmc_repeats, leave=False, use_tqdm=use_tqdm
+    )
+    return single
 
 
 class Fitlpf:
@@ -240,16 +473,22 @@ class Fitlpf:
         datadir (str): Directory to store the downloaded data.
         lpf (TESSLPF): TESSLPF object for the planet.
         singles (list): List of SingleFit objects for each transit.
-        post_samples (list): List of posterior samples for each transit.
-        tcs (list): List of transit centers for each transit.
+        post_samples (list): List of posterior samples for each transit,
+        built on access.
+        tcs_n (np.ndarray): Nominal transit center of each transit.
+        tcs_s (np.ndarray): Uncertainty of the transit center of each
+        transit.
+        tcs (list): List of transit centers for each transit as ufloats,
+        built on access.
         epochs (list): List of epochs for each transit.
 
     Methods:
         get_parameter(): Get the planet parameters.
         print_parameters(): Print the planet parameters.
-        download_data(): Download the TESS data for the planet.
-        de(niter=200, npop=30, datadir=None): Differential evolution
-        optimization for the planet.
+        download_data(product=None, number_of_threads=4): Download the
+        TESS data for the planet.
+        de(niter=200, npop=30, datadir=None, number_of_threads=None):
+        Differential evolution optimization for the planet.
         plot_original_data(): Plot the original TESS data for the planet.
         fit_single(i, niter=100, npop=50, mcmc_repeats=4): Fit a single
         transit.
@@ -277,15 +516,42 @@ class Fitlpf:
         self.prop = []
         self.datadir = datadir
         self.lpf = None
+        self._mean_times = None
+        self._mean_times_lpf = None
         self.singles = []
-        self.post_samples = []
-        self.tcs = []
+        self._post_samples = None
+        self.tcs_n = np.empty(0)
+        self.tcs_s = np.empty(0)
         self.epochs = []
         self.ttv_err = None
         self.ttv_mcmc_raw = None
         self.ttv_mcmc = None
         self.fit_single_v = None
 
+    @property
+    def post_samples(self):
+        """
+        The posterior samples of each single transit as DataFrames.
+
+        They are only needed for inspection, so they are built on first
+        access instead of during the fit, and rebuilt after
+        `get_posterior_samples`.
+        """
+        if self._post_samples is None:
+            self._post_samples = [single.posterior_samples() for single in self.singles]
+        return self._post_samples
+
+    @post_samples.setter
+    def post_samples(self, value):
+        self._post_samples = value
+
+    @property
+    def tcs(self):
+        """
+        The transit centers of each single transit as ufloats.
+        """
+        return [ufloat(n, s) for n, s in zip(self.tcs_n, self.tcs_s)]
+
     def get_parameter(self):
         """
         Retrieves the parameters for the given planet.
@@ -343,19 +609,30 @@ class Fitlpf:
         )
         print(f"Planet Mass Reference: {planet_prop[0]['Mp_ref']}")
 
-    def download_data(self, product=None):
+    def download_data(self, product=None, number_of_threads=4):
         """
         Downloads data from the specified planet and returns
         the manifest of downloaded products.
 
+        The products of different observations are downloaded concurrently
+        through astroquery, so its per-file progress output may interleave.
+
+        Args:
+            product (list): Product subgroups to download. Default is ["LC"].
+            number_of_threads (int): Number of concurrent downloads, kept
+            small to stay gentle on MAST. Default is 4; 1 downloads the
+            observations one after another.
+
         Returns:
-            manifest (str): The manifest of downloaded products.
+            manifest (astropy.table.Table): The manifest of downloaded
+            products.
         """
         if product is None:
             product = ["LC"]
         observations = Observations.query_object(self.planet_name, radius="0 deg")
-        obs_wanted = (observations["dataproduct_type"] == "timeseries") & (
-            observations["obs_collection"] == "TESS"
+        obs_wanted = np.logical_and(
+            observations["dataproduct_type"].data == "timeseries",
+            observations["obs_collection"].data == "TESS",
         )
         print(observations[obs_wanted]["obs_collection", "project", "obs_id"])
         data_products = Observations.get_product_list(observations[obs_wanted])
@@ -364,13 +641,30 @@ class Fitlpf:
         )
 
         print(products_wanted["productFilename"])
-        manifest = Observations.download_products(
-            products_wanted, download_dir=self.full_datadir
-        )
+        if len(products_wanted) == 0:
+            # Nothing to split over threads, let astroquery report it.
+            return Observations.download_products(
+                products_wanted, download_dir=self.full_datadir
+            )
+
+        # One task per observation, so that no two threads create the same
+        # download directory.
+        groups = products_wanted.group_by("obs_id").groups
+        with ThreadPoolExecutor(number_of_threads) as ex:
+            manifests = list(
+                ex.map(
+                    partial(
+                        Observations.download_products,
+                        download_dir=self.full_datadir,
+                    ),
+                    groups,
+                )
+            )
+        manifest = vstack(manifests)
         print("\nfinished!")
         return manifest
 
-    def de(self, niter=200, npop=30, datadir=None):
+    def de(self, niter=200, npop=30, datadir=None, number_of_threads=None):
         """
         Perform differential evolution optimization.
 
@@ -380,6 +674,13 @@ class Fitlpf:
             npop (int): Number of individuals in the population.
             Default is 30.
             datadir (str): Directory path for the data. Default is None.
+            number_of_threads (int): Number of worker processes used to
+            evaluate the population. Default is None, which keeps the
+            serial evaluation of the whole population at once in the
+            current process; process-based evaluation is opt-in because the
+            pickling overhead can outweigh the gain for cheap likelihoods.
+            Either way, the optimization can be continued afterwards with
+            `self.lpf.optimize_global`, which runs in the current process.
 
         Returns:
             None
@@ -398,7 +699,7 @@ class Fitlpf:
             bldur=0.25,
         )
 
-        ep = epoch(self.lpf.times[0].mean(), self.zero_epoch.n, self.period.n)
+        ep = epoch(self._get_mean_times()[0], self.zero_epoch.n, self.period.n)
         tc = zero_epoch + ep * period
 
         self.lpf.set_prior(
@@ -414,7 +715,30 @@ class Fitlpf:
         self.lpf.set_prior(
             "gp_ln_in", "UP", -2, 1
         )  # Uniform prior on the GP input scale
-        self.lpf.optimize_global(niter=niter, npop=npop)
+
+        if number_of_threads is None:
+            self.lpf.optimize_global(niter=niter, npop=npop)
+            return
+
+        with get_context().Pool(
+            number_of_threads, initializer=_init_de_worker, initargs=(self.lpf,)
+        ) as p:
+            self.lpf.optimize_global(
+                niter=niter,
+                npop=npop,
+                pool=p,
+                lnpost=_de_lnposterior,
+                vectorize=False,
+            )
+
+        # optimize_global keeps the optimizer it built, including the closed
+        # pool. Rebuild a serial one from the final population so that the
+        # optimization can be continued with self.lpf.optimize_global.
+        population = self.lpf.de.population.copy()
+        self.lpf.de = None
+        self.lpf.optimize_global(
+            niter=0, npop=npop, population=population, use_tqdm=False
+        )
 
     def plot_original_data(self):
         """
@@ -427,10 +751,55 @@ class Fitlpf:
         timea = self.lpf.timea
         fluxa = self.lpf.ofluxa
         fig, ax = plt.subplots(figsize=(10, 6), dpi=200)
-        plt.plot(timea, fluxa, ".")
+        # Pixel markers drawn as a raster image, a light curve has far too
+        # many points to render each marker as a vector path.
+        ax.plot(timea, fluxa, ",", rasterized=True)
         return fig, ax
 
-    def fit_single(self, i, pbar, niter=100, npop=50, mcmc_repeats=4):
+    def _get_mean_times(self):
+        """
+        Get the mean time of each light curve of `self.lpf`.
+
+        The values are computed once per LPF and reused afterwards.
+        """
+        if self._mean_times is None or self._mean_times_lpf is not self.lpf:
+            self._mean_times = np.fromiter(
+                (time.mean() for time in self.lpf.times),
+                dtype=np.float64,
+                count=len(self.lpf.times),
+            )
+            self._mean_times_lpf = self.lpf
+        return self._mean_times
+
+    def _tc_priors(self, mean_times):
+        """
+        Predict the transit centers and their uncertainties at the given
+        light curve mean times from the linear ephemeris.
+        """
+        eps = epoch_v(mean_times, self.zero_epoch.n, self.period.n)
+        tcs_n = self.zero_epoch.n + eps * self.period.n
+        tcs_s = np.hypot(self.zero_epoch.s, eps * self.period.s)
+        return tcs_n, tcs_s
+
+    def _fit_single_args(self, i, tc_n, tc_s, niter, npop, mcmc_repeats, use_tqdm):
+        """
+        Build the argument tuple of `_fit_single` for the i-th transit.
+        """
+        return (
+            self.planet_name + str(i) + "th",
+            self.lpf.times[i],
+            self.lpf.fluxes[i],
+            tc_n,
+            tc_s,
+            self.period.n,
+            self.period.s,
+            niter,
+            npop,
+            mcmc_repeats,
+            use_tqdm,
+        )
+
+    def fit_single(self, i, niter=100, npop=50, mcmc_repeats=4):
         """
         Fits a single transit light curve.
 
@@ -446,76 +815,71 @@ class Fitlpf:
         Returns:
             SingleFit: The fitted single transit light curve.
         """
-        pbar.set_description("Fitting single transits")
-        single = SingleFit(
-            self.planet_name + str(i) + "th",
-            None,
-            self.lpf.times[i],
-            self.lpf.fluxes[i],
+        tc_n, tc_s = self._tc_priors(self._get_mean_times()[i : i + 1])
+        return _fit_single(
+            self._fit_single_args(i, tc_n[0], tc_s[0], niter, npop, mcmc_repeats, True)
         )
-        ep = epoch(single.timea.mean(), self.zero_epoch.n, self.period.n)
-        tc = self.zero_epoch + ep * self.period
 
-        single.set_prior(
-            "tc", "NP", tc.n, tc.s
-        )  # Wide normal prior on the transit center
-        single.set_prior(
-            "p", "NP", self.period.n, self.period.s
-        )  # Wide normal prior on the orbital period
-        single.set_prior("rho", "UP", 0, 1)
-        # Uniform prior on the stellar density
-        single.set_prior("k2", "UP", 0.0, 0.2**2)
-        # Uniform prior on the area ratio
-        single.optimize_global(niter=niter, npop=npop)
-        single.sample_mcmc(2500, thin=25, repeats=mcmc_repeats, leave=False)
-        pbar.update(1)
-        return single
-
-    def fit_singles(self):
+    def fit_singles(self, niter=100, npop=50, mcmc_repeats=4, number_of_threads=None):
         """
         Fits transit models to individual light curves.
 
+        The transits are independent of each other, so they are fitted in
+        parallel over a pool of worker processes, or in the current process
+        when `number_of_threads` is 1.
+
         Args:
             niter (int): Number of iterations for fitting the transit model.
             Default is 100.
             npop (int): Number of populations for the genetic algorithm.
             Default is 50.
+            mcmc_repeats (int): Number of MCMC repeats. Default is 4.
+            number_of_threads (int): Number of worker processes.
+            Default is None, which uses all available CPUs.
 
         Returns:
             None
         """
-        # self.fit_single_v = np.vectorize(self.fit_single)
-        # self.singles = self.fit_single_v(np.arange(len(self.lpf.times)))
-        with tqdm(total=len(np.arange(len(self.lpf.times))) + 1) as pbar:
-            # pbar.set_description("Fitting single transits: ")
-            self.singles = np.vectorize(self.fit_single)(
-                np.arange(len(self.lpf.times)), pbar
+        # The transit center priors of all transits are predicted at once.
+        tcs_n, tcs_s = self._tc_priors(self._get_mean_times())
+        parameters = [
+            self._fit_single_args(
+                i, tcs_n[i], tcs_s[i], niter, npop, mcmc_repeats, False
             )
-        self.post_samples = []
-        self.tcs = []
-        for single in self.singles:
-            df = single.posterior_samples()
-            self.post_samples.append(df)
-            tc = ufloat(df["tc"].mean(), df["tc"].std())
-            self.tcs.append(tc)
-
-        self.epochs = epoch_v(getn_v(self.tcs), self.zero_epoch.n, self.period.n)
+            for i in range(len(self.lpf.times))
+        ]
+        progress = {
+            "total": len(parameters),
+            "desc": "Fitting single transits",
+            "mininterval": 0.5,
+            "miniters": 1,
+        }
+        if number_of_threads == 1:
+            self.singles = list(tqdm(map(_fit_single, parameters), **progress))
+        else:
+            # Workers are spawned rather than forked: forking after pytransit
+            # has run Numba's threaded kernels in this process is unsafe.
+            with get_context("spawn").Pool(number_of_threads) as p:
+                self.singles = list(tqdm(p.imap(_fit_single, parameters), **progress))
+        self.get_posterior_samples()
 
     def get_posterior_samples(self):
         """
-        Retrieves the posterior samples for each single transit in the dataset.
+        Retrieves the transit centers of each single transit in the dataset
+        from their posterior samples.
 
         Returns:
             None
         """
-        self.post_samples = []
-        self.tcs = []
-        for single in self.singles:
-            df = single.posterior_samples()
-            self.post_samples.append(df)
-            tc = ufloat(df["tc"].mean(), df["tc"].std())
-            self.tcs.append(tc)
-        self.epochs = epoch_v(getn_v(self.tcs), self.zero_epoch.n, self.period.n)
+        self._post_samples = None
+        n_singles = len(self.singles)
+        self.tcs_n = np.empty(n_singles)
+        self.tcs_s = np.empty(n_singles)
+        for i, single in enumerate(self.singles):
+            tc = single.tc_chain()
+            self.tcs_n[i] = tc.mean()
+            self.tcs_s[i] = tc.std(ddof=1)
+        self.epochs = epoch_v(self.tcs_n, self.zero_epoch.n, self.period.n)
 
     def calculate_ttv(self):
         """
@@ -524,20 +888,13 @@ class Fitlpf:
         Returns:
             None
         """
-        day_to_s = 24 * 60 * 60
-        tcs = getn_v(self.tcs)
-        epochs = self.epochs
-        self.ttv_err = (
-            gets_v(self.tcs) + self.period.s * (epochs - epochs[0])
-        ) * day_to_s
-
-        def f_1(x, a, b):
-            return a * x + b
-
-        a, b = curve_fit(f_1, epochs - epochs[0], tcs - tcs[0])[0]
-
-        self.ttv_mcmc_raw = (tcs - tcs[0] - a * (epochs - epochs[0]) + b) * DAY_TO_SEC
-        self.ttv_mcmc = self.ttv_mcmc_raw - self.ttv_mcmc_raw.mean()
+        self.ttv_mcmc_raw, self.ttv_mcmc, self.ttv_err = _ttv_residuals(
+            self.tcs_n,
+            self.tcs_s,
+            np.asarray(self.epochs),
+            self.period.s,
+            DAY_TO_SEC,
+        )
 
     def plot_tcs(self, plot_zero_epoch=False):
         """
@@ -552,15 +909,16 @@ class Fitlpf:
             ax (matplotlib.axes.Axes): The axes object.
         """
         epochs = self.epochs
-        tcs = self.tcs
+        tcs_n = self.tcs_n
+        tcs_s = self.tcs_s
         if plot_zero_epoch is True:
-            tcs = np.insert(tcs, 0, self.zero_epoch)
+            tcs_n = np.insert(tcs_n, 0, self.zero_epoch.n)
+            tcs_s = np.insert(tcs_s, 0, self.zero_epoch.s)
             epochs = np.insert(epochs, 0, 0)
         fig, ax = plt.subplots(figsize=(10, 6), dpi=200)
-        # plt.plot(epochs,getn_v(self.tcs),'.')
-        plt.errorbar(epochs, getn_v(tcs), yerr=gets_v(tcs), fmt="o")
-        plt.xlabel("Epoch")
-        plt.ylabel(r"$t_c$ (MJD)")
+        ax.errorbar(epochs, tcs_n, yerr=tcs_s, fmt="o")
+        ax.set_xlabel("Epoch")
+        ax.set_ylabel(r"$t_c$ (MJD)")
 
         return fig, ax
 
@@ -582,6 +940,7 @@ class Fitlpf:
         epochs = self.epochs
         ttv_mcmc = self.ttv_mcmc
         ttv_raw = self.ttv_mcmc_raw
+        ttv_mcmc_raw = ttv_raw
         ttv_err = self.ttv_err
 
         if plot_zero_epoch is True:
@@ -605,10 +964,8 @@ class Fitlpf:
             ttv = ttv_mcmc_raw
 
         fig, ax = plt.subplots(figsize=(10, 6), dpi=200)
-        plt.errorbar(epochs, ttv, yerr=ttv_err, fmt="o")
-
-        # plt.plot(epochs,getn_v(re)*day_to_s,linestyle='',marker='.',markersize=12)
-        plt.xlabel("Epoch")
-        plt.ylabel("residual (s)")
+        ax.errorbar(epochs, ttv, yerr=ttv_err, fmt="o")
+        ax.set_xlabel("Epoch")
+        ax.set_ylabel("residual (s)")
 
         return fig, ax
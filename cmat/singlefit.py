@@ -14,6 +14,11 @@ parameters using the posterion_samples() method.
 
 
 class SingleFit(BaseLPF):
+    def tc_chain(self):
+        # Flattened MCMC chain of the transit center, read straight from the
+        # sampler without building the full posterior DataFrame.
+        return self.sampler.get_chain(flat=True)[:, self.ps.names.index("tc")]
+
     def plot_single_transit(
         self,
         method="de",